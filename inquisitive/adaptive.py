@@ -0,0 +1,299 @@
+"""Provides the AdaptiveEngine class, which picks questions based on how well
+players are doing."""
+
+from collections import deque
+from concurrent.futures import Executor, Future
+from threading import Lock
+from time import monotonic, sleep
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from attr import Factory, attrib, attrs
+
+from .open_trivia_db import (Question, QuestionDifficulties, QuestionFactory,
+                             QuestionRecord, TokenEmpty)
+
+difficulties: List[QuestionDifficulties] = list(QuestionDifficulties)
+
+
+def make_pools() -> Dict[QuestionDifficulties, Deque[QuestionRecord]]:
+    """Return an empty question pool for every difficulty."""
+    return {d: deque() for d in difficulties}
+
+
+@attrs(auto_attribs=True)
+class PlayerStats:
+    """Running performance figures for a single player.
+
+    Accuracy and response time are exponential moving averages, so recording
+    an answer costs the same no matter how long the session has been running.
+
+    :ivar smoothing: How much weight the most recent answer carries.
+
+    :ivar accuracy: The weighted proportion of correct answers.
+
+    :ivar response_time: The weighted number of seconds taken to answer.
+
+    :ivar difficulty: The difficulty the player is currently playing at.
+
+    :ivar last_category: The category of the last question asked.
+    """
+
+    smoothing: float = 0.3
+    accuracy: float = 0.5
+    response_time: float = 0.0
+    answered: int = 0
+    correct: int = 0
+    difficulty: QuestionDifficulties = QuestionDifficulties.easy
+    last_category: Optional[str] = None
+
+    def record(self, correct: bool, response_time: float) -> None:
+        """Record an answer.
+
+        :param correct: Whether or not the answer was correct.
+
+        :param response_time: How many seconds the player took to answer.
+        """
+        s: float = self.smoothing
+        if self.answered == 0:
+            self.response_time = response_time
+        else:
+            self.response_time += s * (response_time - self.response_time)
+        self.accuracy += s * (float(correct) - self.accuracy)
+        self.answered += 1
+        if correct:
+            self.correct += 1
+
+
+@attrs(auto_attribs=True)
+class AdaptiveEngine:
+    """Picks questions for players based on their performance.
+
+    Questions are held as compact records in a pool per difficulty, and only
+    turned back into full questions when they are asked. When a pool runs low,
+    it is refilled from ``factory``, using ``executor`` if one has been
+    provided.
+
+    :ivar factory: The factory to get new questions from.
+
+    :ivar executor: The executor to refill pools with.
+
+        If this value is ``None``, pools will be refilled in the calling
+        thread.
+
+    :ivar batch_size: The number of questions to request at once.
+
+    :ivar low_water: When a pool holds fewer questions than this, it will be
+        refilled.
+
+    :ivar promote_accuracy: Players whose accuracy reaches this value will be
+        moved up a difficulty.
+
+    :ivar demote_accuracy: Players whose accuracy falls to this value will be
+        moved down a difficulty.
+
+    :ivar slow_response: Players who take longer than this many seconds to
+        answer on average will not be promoted.
+
+    :ivar min_interval: The minimum number of seconds between requests to
+        ``factory``. Requests are made one at a time, and a request which
+        comes too soon after the last one waits first, since the Open Trivia
+        Database only allows one request every 5 seconds.
+
+    :ivar last_error: The error raised by the most recent refill, or ``None``
+        if it succeeded.
+    """
+
+    factory: QuestionFactory
+    executor: Optional[Executor] = None
+    batch_size: int = 10
+    low_water: int = 5
+    promote_accuracy: float = 0.75
+    demote_accuracy: float = 0.4
+    slow_response: float = 15.0
+    min_interval: float = 5.0
+
+    pools: Dict[QuestionDifficulties, Deque[QuestionRecord]] = attrib(
+        default=Factory(make_pools), init=False, repr=False
+    )
+    players: Dict[str, PlayerStats] = attrib(
+        default=Factory(dict), init=False, repr=False
+    )
+    pending: Set[QuestionDifficulties] = attrib(
+        default=Factory(set), init=False, repr=False
+    )
+    lock: Lock = attrib(default=Factory(Lock), init=False, repr=False)
+    fetch_lock: Lock = attrib(default=Factory(Lock), init=False, repr=False)
+    last_fetch: Optional[float] = attrib(default=None, init=False, repr=False)
+    last_error: Optional[BaseException] = attrib(
+        default=None, init=False, repr=False
+    )
+
+    def get_player(self, name: str) -> PlayerStats:
+        """Return the stats for the player with the given name, creating them
+        if necessary."""
+        stats: Optional[PlayerStats] = self.players.get(name, None)
+        if stats is None:
+            stats = PlayerStats()
+            self.players[name] = stats
+        return stats
+
+    def record_answer(
+        self, name: str, correct: bool, response_time: float
+    ) -> None:
+        """Record an answer, and move the player up or down a difficulty if
+        necessary.
+
+        :param name: The name of the player who answered.
+
+        :param correct: Whether or not the answer was correct.
+
+        :param response_time: How many seconds the player took to answer.
+        """
+        stats: PlayerStats = self.get_player(name)
+        stats.record(correct, response_time)
+        index: int = difficulties.index(stats.difficulty)
+        if (
+            stats.accuracy >= self.promote_accuracy and
+            stats.response_time <= self.slow_response
+        ):
+            index = min(index + 1, len(difficulties) - 1)
+        elif stats.accuracy <= self.demote_accuracy:
+            index = max(index - 1, 0)
+        if difficulties[index] is not stats.difficulty:
+            stats.difficulty = difficulties[index]
+            # Start from the middle again, so the player isn't immediately
+            # moved again.
+            stats.accuracy = (self.promote_accuracy + self.demote_accuracy) / 2
+
+    def choose_difficulty(self, stats: PlayerStats) -> QuestionDifficulties:
+        """Return the difficulty the next question should come from.
+
+        If the pool for the player's difficulty is empty, the nearest
+        difficulty with questions available is used instead.
+
+        :param stats: The stats of the player who will be asked.
+        """
+        index: int = difficulties.index(stats.difficulty)
+        d: QuestionDifficulties
+        for d in sorted(difficulties, key=lambda d: abs(
+            difficulties.index(d) - index
+        )):
+            if self.pools[d]:
+                return d
+        return stats.difficulty
+
+    def next_question(self, name: str) -> Optional[Question]:
+        """Return the next question for the given player.
+
+        Where possible, the player will not be asked two questions from the
+        same category in a row.
+
+        If there are no questions in any pool, ``None`` is returned, and the
+        caller should try again once the pools have been refilled.
+
+        :param name: The name of the player to be asked.
+        """
+        stats: PlayerStats = self.get_player(name)
+        # Refill the player's own pool, even if they are going to be given a
+        # question from another one, so that they get the right difficulty
+        # soon.
+        if len(self.pools[stats.difficulty]) < self.low_water:
+            self.refill(stats.difficulty)
+        d: QuestionDifficulties = self.choose_difficulty(stats)
+        pool: Deque[QuestionRecord] = self.pools[d]
+        with self.lock:
+            if not pool:
+                return None
+            r: QuestionRecord = pool.popleft()
+            if r.category_name == stats.last_category and pool:
+                pool.append(r)
+                r = pool.popleft()
+        stats.last_category = r.category_name
+        if len(pool) < self.low_water:
+            self.refill(d)
+        return r.to_question()
+
+    def snapshot(
+        self
+    ) -> Dict[QuestionDifficulties, Tuple[QuestionRecord, ...]]:
+        """Return a copy of every pool, which is safe to look through while
+        pools are being refilled."""
+        with self.lock:
+            return {d: tuple(pool) for d, pool in self.pools.items()}
+
+    def trim(self) -> None:
+        """Drop questions from every pool, so that each holds no more than
+        ``low_water`` questions."""
+        with self.lock:
+            pool: Deque[QuestionRecord]
+            for pool in self.pools.values():
+                while len(pool) > self.low_water:
+                    pool.pop()
+
+    def refill(self, difficulty: QuestionDifficulties) -> None:
+        """Refill the pool for the given difficulty.
+
+        If the pool is already being refilled, nothing happens.
+
+        :param difficulty: The difficulty of the pool to refill.
+        """
+        with self.lock:
+            if difficulty in self.pending:
+                return
+            self.pending.add(difficulty)
+        if self.executor is None:
+            try:
+                self.fetch(difficulty)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+        else:
+            future: Future = self.executor.submit(self.fetch, difficulty)
+            future.add_done_callback(self.fetch_done)
+
+    def fetch_done(self, future: Future) -> None:
+        """Record any error raised by a background refill."""
+        self.last_error = future.exception()
+
+    def throttle(self) -> None:
+        """Wait until at least ``min_interval`` seconds have passed since the
+        last request, then note the time of the next one.
+
+        This method should only be called with ``fetch_lock`` held.
+        """
+        if self.last_fetch is not None:
+            wait: float = self.min_interval - (monotonic() - self.last_fetch)
+            if wait > 0:
+                sleep(wait)
+        self.last_fetch = monotonic()
+
+    def fetch(self, difficulty: QuestionDifficulties) -> None:
+        """Get more questions for the given difficulty, and add them to the
+        relevant pool.
+
+        If the factory's token has run out of questions, it is reset, so that
+        the next refill can succeed.
+
+        If another fetch is in progress, or the last one was less than
+        ``min_interval`` seconds ago, this method waits first.
+
+        :param difficulty: The difficulty of the questions to get.
+        """
+        try:
+            with self.fetch_lock:
+                self.throttle()
+                try:
+                    questions: List[Question] = self.factory.get_questions(
+                        amount=self.batch_size, difficulty=difficulty
+                    )
+                except TokenEmpty:
+                    self.throttle()
+                    self.factory.reset_token()
+                    raise
+            with self.lock:
+                self.pools[difficulty].extend(
+                    QuestionRecord.from_question(q) for q in questions
+                )
+        finally:
+            with self.lock:
+                self.pending.discard(difficulty)
@@ -0,0 +1,146 @@
+"""Provides the MemoryBudget class, for keeping long sessions within a fixed
+amount of memory."""
+
+from collections import deque
+from sys import getsizeof
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from attr import Factory, attrib, attrs
+
+SizeGetterType = Callable[[], Any]
+MeasureFunctionType = Callable[[Any], int]
+ReleaseFunctionType = Callable[[], None]
+
+# Objects of these types are counted, but never looked inside.
+atomic_types: Tuple[type, ...] = (str, bytes, int, float, bool, type(None))
+
+
+def deep_size(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """Return roughly how many bytes ``obj`` and everything it holds take up.
+
+    Containers and attrs instances are followed. Objects which are reachable
+    more than once are only counted once.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size: int = getsizeof(obj)
+    if isinstance(obj, atomic_types):
+        return size
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_size(key, seen) + deep_size(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        for item in obj:
+            size += deep_size(item, seen)
+    elif hasattr(obj, '__attrs_attrs__'):
+        for a in obj.__attrs_attrs__:
+            size += deep_size(getattr(obj, a.name), seen)
+    return size
+
+
+@attrs(auto_attribs=True)
+class MemoryReport:
+    """How much memory each subsystem holds.
+
+    :ivar sizes: Subsystem names mapped to sizes in bytes.
+
+    :ivar limit: The budget the sizes were measured against.
+    """
+
+    sizes: Dict[str, int]
+    limit: int
+
+    @property
+    def total(self) -> int:
+        """The total number of bytes held by all subsystems."""
+        return sum(self.sizes.values())
+
+    def __str__(self) -> str:
+        lines: List[str] = []
+        name: str
+        size: int
+        for name, size in sorted(
+            self.sizes.items(), key=lambda item: item[1], reverse=True
+        ):
+            lines.append(f'{name}: {size} bytes')
+        lines.append(f'Total: {self.total} / {self.limit} bytes')
+        return '\n'.join(lines)
+
+
+@attrs(auto_attribs=True)
+class MemoryBudget:
+    """Keeps track of how much memory the game's subsystems hold.
+
+    Subsystems are added with :meth:`add`, and when the budget is exceeded,
+    :meth:`enforce` releases the largest ones first.
+
+    :ivar limit: The maximum number of bytes all subsystems should hold.
+    """
+
+    limit: int
+    getters: Dict[str, SizeGetterType] = attrib(
+        default=Factory(dict), init=False, repr=False
+    )
+    measures: Dict[str, MeasureFunctionType] = attrib(
+        default=Factory(dict), init=False, repr=False
+    )
+    releasers: Dict[str, ReleaseFunctionType] = attrib(
+        default=Factory(dict), init=False, repr=False
+    )
+
+    def add(
+        self, name: str, getter: SizeGetterType,
+        release: Optional[ReleaseFunctionType] = None,
+        measure: MeasureFunctionType = deep_size
+    ) -> None:
+        """Add a subsystem.
+
+        :param name: The name to show in reports.
+
+        :param getter: A function which returns the objects held by the
+            subsystem.
+
+        :param release: A function which frees memory held by the subsystem.
+
+        :param measure: A function which returns the size in bytes of whatever
+            ``getter`` returns. Use this for objects whose memory is not held
+            by Python, such as sound buffers.
+        """
+        self.getters[name] = getter
+        self.measures[name] = measure
+        if release is not None:
+            self.releasers[name] = release
+
+    def report(self) -> MemoryReport:
+        """Return a report on how much memory each subsystem holds."""
+        sizes: Dict[str, int] = {}
+        name: str
+        getter: SizeGetterType
+        for name, getter in self.getters.items():
+            sizes[name] = self.measures[name](getter())
+        return MemoryReport(sizes, self.limit)
+
+    def enforce(self) -> List[str]:
+        """Release subsystems, largest first, until the budget is no longer
+        exceeded.
+
+        Returns the names of the subsystems which were released.
+        """
+        released: List[str] = []
+        r: MemoryReport = self.report()
+        total: int = r.total
+        name: str
+        size: int
+        for name, size in sorted(
+            r.sizes.items(), key=lambda item: item[1], reverse=True
+        ):
+            if total <= self.limit:
+                break
+            if name in self.releasers:
+                self.releasers[name]()
+                released.append(name)
+                total -= size - self.measures[name](self.getters[name]())
+        return released
@@ -1,13 +1,19 @@
 """A small package for working with data from https://opentdb.com/."""
 
 from enum import Enum
-from html import unescape
-from typing import Any, Dict, List, Optional, Union, cast
+from sys import intern
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
-from attr import attrs
+from attr import attrib, attrs
 from requests import Response, get
 
+from .text import (category_slug, category_speech, make_slug, question_id,
+                   question_speech, unescape_text)
+
 token_request_url: str = 'https://opentdb.com/api_token.php?command=request'
+token_reset_url: str = (
+    'https://opentdb.com/api_token.php?command=reset&token={}'
+)
 get_questions_url: str = 'https://opentdb.com/api.php?token={}&amount={}'
 
 
@@ -52,12 +58,20 @@ class TokenEmpty(OpenTriviaDbError):
     pass
 
 
+class RateLimit(OpenTriviaDbError):
+    """Too many requests have occurred. Each IP can only access the API once
+    every 5 seconds.
+    """
+    pass
+
+
 api_errors = [
     Success,
     NoResults,
     InvalidParameter,
     TokenNotFound,
-    TokenEmpty
+    TokenEmpty,
+    RateLimit
 ]
 
 
@@ -141,7 +155,22 @@ class QuestionDifficulties(Enum):
 
 @attrs(auto_attribs=True)
 class Question:
-    """A question from Open Trivia DB."""
+    """A question from Open Trivia DB.
+
+    The normalised forms of the question are worked out when it is created, so
+    that they can be reused for display, speech, and filenames. If they have
+    already been worked out, they can be passed as keyword arguments instead.
+
+    :ivar id: An ID which is the same every time this question is fetched.
+
+    :ivar slug: A slug made from the text of this question.
+
+    :ivar speech: The text of this question, as it should be spoken.
+
+    :ivar category_slug: A slug made from the category name.
+
+    :ivar category_speech: The category name, as it should be spoken.
+    """
 
     category_name: str
     text: str
@@ -149,10 +178,93 @@ class Question:
     difficulty: QuestionDifficulties
     answers: List[Answer]
 
+    id: str = attrib(kw_only=True, eq=False, repr=False)
+    slug: str = attrib(kw_only=True, eq=False, repr=False)
+    speech: str = attrib(kw_only=True, eq=False, repr=False)
+    category_slug: str = attrib(kw_only=True, eq=False, repr=False)
+    category_speech: str = attrib(kw_only=True, eq=False, repr=False)
+
+    @id.default
+    def get_id(instance: 'Question') -> str:
+        return question_id(
+            instance.category_name, instance.difficulty.name, instance.text
+        )
+
+    @slug.default
+    def get_slug(instance: 'Question') -> str:
+        return make_slug(instance.text)
+
+    @speech.default
+    def get_speech(instance: 'Question') -> str:
+        return question_speech(
+            instance.text, instance.type is QuestionTypes.boolean
+        )
+
+    @category_slug.default
+    def get_category_slug(instance: 'Question') -> str:
+        return category_slug(instance.category_name)
+
+    @category_speech.default
+    def get_category_speech(instance: 'Question') -> str:
+        return category_speech(instance.category_name)
+
     def __str__(self) -> str:
         return f'{self.category_name}:\n{self.text}'
 
 
+@attrs(auto_attribs=True, frozen=True, slots=True)
+class QuestionRecord:
+    """A compact form of ``Question``, for keeping many questions around.
+
+    Answers are held as plain strings, and category names are interned, so
+    that questions from the same category share a single string. The
+    normalised forms of the question are kept, so that they are not worked
+    out again when the question is asked.
+
+    :ivar correct: The index of the correct answer in ``answers``.
+    """
+
+    category_name: str
+    text: str
+    type: QuestionTypes
+    difficulty: QuestionDifficulties
+    answers: Tuple[str, ...]
+    correct: int
+    id: str
+    slug: str
+    speech: str
+    category_slug: str
+    category_speech: str
+
+    @classmethod
+    def from_question(cls, question: Question) -> 'QuestionRecord':
+        """Return a record made from the given question."""
+        correct: int = 0
+        i: int
+        a: Answer
+        for i, a in enumerate(question.answers):
+            if a.correct:
+                correct = i
+                break
+        return cls(
+            intern(question.category_name), question.text, question.type,
+            question.difficulty, tuple(a.text for a in question.answers),
+            correct, question.id, question.slug, question.speech,
+            intern(question.category_slug), intern(question.category_speech)
+        )
+
+    def to_question(self) -> Question:
+        """Return a full question made from this record."""
+        return Question(
+            self.category_name, self.text, self.type, self.difficulty, [
+                Answer(text, i == self.correct)
+                for i, text in enumerate(self.answers)
+            ], id=self.id, slug=self.slug, speech=self.speech,
+            category_slug=self.category_slug,
+            category_speech=self.category_speech
+        )
+
+
 def get_url(url: str, *args, **kwargs) -> Dict[str, Any]:
     """Gets a URL from Open Trivia DB, and results the body as JSON.
 
@@ -180,6 +292,12 @@ def get_token() -> str:
     return get_url(token_request_url)['token']
 
 
+def reset_token(token: str) -> str:
+    """Reset the given token, so that questions which have already been
+    returned can be returned again. The token is returned."""
+    return get_url(token_reset_url.format(token))['token']
+
+
 def get_categories() -> List[Category]:
     """This function returns all the categories in the Open Trivia Database."""
     r: Response = get('https://opentdb.com/api_category.php')
@@ -226,10 +344,12 @@ def get_questions(
     results: List[Dict[str, Any]] = get_url(u)['results']
     questions: List[Question] = []
     for r in results:
-        answers: List[Answer] = [Answer(unescape(r['correct_answer']), True)]
+        answers: List[Answer] = [
+            Answer(unescape_text(r['correct_answer']), True)
+        ]
         text: str
         for text in r['incorrect_answers']:
-            answers.append(Answer(unescape(text), False))
+            answers.append(Answer(unescape_text(text), False))
         t: QuestionTypes
         for t in QuestionTypes:
             if t.name == r['type']:
@@ -242,8 +362,12 @@ def get_questions(
                 break
         else:
             raise UnknownDifficultyError(r['difficulty'])
+        # The category is left as it is, so that category slugs match those
+        # in existing question trees.
         questions.append(
-            Question(r['category'], unescape(r['question']), t, d, answers)
+            Question(
+                r['category'], unescape_text(r['question']), t, d, answers
+            )
         )
     return questions
 
@@ -258,6 +382,15 @@ class QuestionFactory:
         """Generate a token for this instance."""
         self.token = get_token()
 
+    def reset_token(self) -> None:
+        """Reset the token for this instance.
+
+        If ``self.token`` is ``None``, ``InvalidToken`` will be raised.
+        """
+        if self.token is None:
+            raise InvalidTokenError()
+        self.token = reset_token(self.token)
+
     def get_questions(self, **kwargs) -> List[Question]:
         """Gets questions using ``get_questions``.
 
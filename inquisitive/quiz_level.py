@@ -2,18 +2,26 @@
 
 from pathlib import Path
 from random import shuffle
+from time import monotonic
 from typing import Callable, List, Optional
 
-from attr import attrib, attrs
+from attr import Factory, attrib, attrs
 from earwax import Level, StaggeredPromise, Track, hat_directions
 from earwax.types import StaggeredPromiseGeneratorType
+from pyglet.clock import schedule_once, unschedule
 from pyglet.window import key
 
 from . import sounds
-from .open_trivia_db import Answer, Question, QuestionTypes
+from .adaptive import AdaptiveEngine
+from .open_trivia_db import Answer, Question
 
 letters: List[str] = ['A', 'B', 'C', 'D']
 
+# How long to wait before asking for a question again, when none were
+# available. The delay doubles after each try, up to the maximum.
+first_retry_delay: float = 1.0
+max_retry_delay: float = 30.0
+
 
 @attrs(auto_attribs=True)
 class AnswerContainer:
@@ -40,16 +48,13 @@ class QuizLevel(Level):
     question: Optional[Question] = attrib(default=None, init=False)
     answers: Optional[AnswerContainer] = attrib(default=None, init=False)
     position: int = attrib(default=-1, init=False)
+    asked_at: float = attrib(default=0.0, init=False)
+    retry_delay: Optional[float] = attrib(default=None, init=False)
     guess_promise: Optional[StaggeredPromise] = attrib(
         default=None, init=False
     )
 
     def __attrs_post_init__(self) -> None:
-        self.tracks.append(
-            Track(
-                self.music_path, gain=self.game.config.sound.music_volume.value
-            )
-        )
         super().__attrs_post_init__()
         self.action('Repeat the question', symbol=key.R)(self.repeat_question)
         i: int
@@ -70,31 +75,100 @@ class QuizLevel(Level):
 
         @self.event
         def on_push() -> None:
+            self.load_tracks()
             self.next_question()
 
+        @self.event
+        def on_pop() -> None:
+            self.release()
+
+    def load_tracks(self) -> None:
+        """Create the music track, if it does not already exist.
+
+        This is called when the level is pushed, so that levels which have
+        never been pushed do not hold a track.
+        """
+        if not self.tracks:
+            self.tracks.append(
+                Track(
+                    self.music_path,
+                    gain=self.game.config.sound.music_volume.value
+                )
+            )
+
+    def release(self) -> None:
+        """Stop and drop the music track, and forget the current question.
+
+        This is called when the level is popped, so that levels which are not
+        on the stack hold as little memory as possible.
+        """
+        if self.guess_promise is not None:
+            self.guess_promise.cancel()
+            self.guess_promise = None
+        self.stop_tracks()
+        self.tracks.clear()
+        unschedule(self.retry_question)
+        self.retry_delay = None
+        self.question = None
+        self.answers = None
+        self.position = -1
+
+    def get_question(self) -> Optional[Question]:
+        """Return the question to ask next, or ``None`` if there are no
+        questions available yet."""
+        return self.questions.pop()
+
     def next_question(self) -> None:
-        """Get the next question, and speak its text."""
+        """Get the next question, and speak its text.
+
+        If no question is available, try again later, waiting longer each
+        time. The player is only told they are waiting the first time.
+        """
         self.position = -1
-        self.question = self.questions.pop()
+        self.question = self.get_question()
+        if self.question is None:
+            self.answers = None
+            if self.retry_delay is None:
+                self.game.output('Waiting for more questions...')
+                self.retry_delay = first_retry_delay
+            else:
+                self.retry_delay = min(self.retry_delay * 2, max_retry_delay)
+            schedule_once(self.retry_question, self.retry_delay)
+            return
+        self.retry_delay = None
         self.answers = AnswerContainer(self.question.answers.copy())
+        self.asked_at = monotonic()
         self.repeat_question()
 
+    def retry_question(self, dt: float) -> None:
+        """Try to ask the next question again."""
+        self.next_question()
+
+    def answered(self, answer: Answer, response_time: float) -> None:
+        """Called when the player has guessed.
+
+        By default, this method does nothing.
+
+        :param answer: The answer that was guessed.
+
+        :param response_time: The number of seconds between the question being
+            asked, and the guess being made.
+        """
+        pass
+
     def question_string(self) -> str:
         """Return the current question as a string, suitable for speaking by
         the arrows, or the r key.
         """
         q: Optional[Question] = self.question
         assert q is not None
-        prefix: str = ''
-        if q.type is QuestionTypes.boolean:
-            prefix = 'True or false: '
-        return prefix + q.text
+        return q.speech
 
     def repeat_question(self) -> None:
         """Repeat the current question."""
         q: Optional[Question] = self.question
-        assert q is not None
-        assert self.answers is not None
+        if q is None or self.answers is None:
+            return  # Still waiting for a question.
         strings: List[str] = []
         i: int
         a: Answer
@@ -102,7 +176,7 @@ class QuizLevel(Level):
             strings.append(f'{letters[i]}: {a.text}')
         strings.insert(-1, 'or')
         self.game.output(
-            f'{q.category_name}: {self.question_string()}'
+            f'{q.category_speech}: {self.question_string()}'
             '\n\n' + ','.join(strings)
         )
 
@@ -113,7 +187,7 @@ class QuizLevel(Level):
         """
 
         def inner() -> None:
-            if self.guess_promise is not None:
+            if self.guess_promise is not None or self.answers is None:
                 return
 
             @StaggeredPromise.decorate
@@ -123,6 +197,7 @@ class QuizLevel(Level):
                     a: Answer = self.answers.answers[i]
                 except IndexError:
                     return  # There are not that many possible answers.
+                self.answered(a, monotonic() - self.asked_at)
                 p: Path = sounds.icons.paths[
                     'correct.mp3' if a.correct else 'wrong.mp3'
                 ]
@@ -156,15 +231,15 @@ class QuizLevel(Level):
 
     def move_down(self) -> None:
         """Read the next bit of information."""
-        assert self.question is not None
-        assert self.answers is not None
+        if self.question is None or self.answers is None:
+            return
         self.position = min(self.position + 1, len(self.answers.answers) - 1)
         self.speak_answer()
 
     def move_up(self) -> None:
         """Read the previous bit of information."""
-        assert self.question is not None
-        assert self.answers is not None
+        if self.question is None or self.answers is None:
+            return
         self.position = max(-1, self.position - 1)
         if self.position == -1:
             self.game.output(self.question_string(), interrupt=True)
@@ -175,3 +250,26 @@ class QuizLevel(Level):
         """Allows guessing with the enter key."""
         if self.position != -1:
             return self.guess(self.position)()
+
+
+@attrs(auto_attribs=True)
+class AdaptiveQuizLevel(QuizLevel):
+    """A quiz level whose questions are chosen by an ``AdaptiveEngine``
+    instance, rather than taken from a fixed list.
+
+    :ivar engine: The engine to get questions from.
+
+    :ivar player: The name of the player whose stats should be updated.
+    """
+
+    engine: AdaptiveEngine
+    player: str = 'Player 1'
+    questions: List[Question] = attrib(default=Factory(list), init=False)
+
+    def get_question(self) -> Optional[Question]:
+        """Get the next question from the engine."""
+        return self.engine.next_question(self.player)
+
+    def answered(self, answer: Answer, response_time: float) -> None:
+        """Tell the engine how the player did."""
+        self.engine.record_answer(self.player, answer.correct, response_time)
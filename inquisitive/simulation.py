@@ -0,0 +1,358 @@
+"""Provides classes for running quiz levels without a window or sound.
+
+Scripted players take turns guessing, and a report is produced, showing how
+much CPU time each turn took, and how memory use grew over the session.
+
+Importing this module stops pyglet from creating its hidden window, so it must
+be imported before earwax or pyglet.window.
+"""
+
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from random import Random
+from time import process_time
+from typing import Any, Dict, Iterator, List, Optional
+
+import pyglet
+
+# Simulations may run on machines without a display.
+pyglet.options['shadow_window'] = False
+
+from attr import Factory, attrib, attrs  # noqa: E402
+from earwax import EarwaxConfig  # noqa: E402
+from pyglet.clock import Clock, get_default, set_default  # noqa: E402
+
+from . import sounds  # noqa: E402
+from .adaptive import AdaptiveEngine  # noqa: E402
+from .open_trivia_db import (  # noqa: E402
+    Answer, Question, QuestionDifficulties, QuestionFactory, QuestionTypes
+)
+from .quiz_level import AdaptiveQuizLevel, QuizLevel  # noqa: E402
+
+
+@attrs(auto_attribs=True)
+class StubSoundPlayer:
+    """A sound player which counts sounds instead of playing them."""
+
+    played: int = 0
+
+    def play_path(self, path: Path) -> None:
+        """Pretend to play a sound."""
+        self.played += 1
+
+
+sound_directories: List[str] = [
+    'music', 'icons', 'footsteps', 'players', 'lifelines'
+]
+
+
+@contextmanager
+def stubbed_sounds() -> Iterator[None]:
+    """Make sound paths available without loading any audio.
+
+    The real sound directories are put back afterwards.
+    """
+    saved: Dict[str, Any] = {
+        name: getattr(sounds, name) for name in sound_directories
+        if hasattr(sounds, name)
+    }
+    name: str
+    try:
+        for name in sound_directories:
+            setattr(
+                sounds, name,
+                sounds.PathDirectory(getattr(sounds, f'{name}_directory'))
+            )
+        yield
+    finally:
+        for name in sound_directories:
+            if name in saved:
+                setattr(sounds, name, saved[name])
+            elif hasattr(sounds, name):
+                delattr(sounds, name)
+
+
+@attrs(auto_attribs=True)
+class HeadlessGame:
+    """Stands in for an earwax ``Game`` instance.
+
+    Only the parts of the game used by quiz levels are provided. Speech is
+    counted rather than spoken, and only the most recent line is kept, so that
+    long sessions do not grow without bound.
+    """
+
+    name: str = 'Inquisitive'
+    config: EarwaxConfig = Factory(EarwaxConfig)
+    interface_sound_player: StubSoundPlayer = Factory(StubSoundPlayer)
+    spoken: int = 0
+    last_output: Optional[str] = None
+
+    def output(self, text: str, interrupt: bool = False) -> None:
+        """Pretend to speak some text."""
+        self.spoken += 1
+        self.last_output = text
+
+
+@attrs(auto_attribs=True)
+class SyntheticFactory(QuestionFactory):
+    """A question factory which makes up questions, so that simulations do not
+    need the network.
+
+    Every question is numbered, so no two questions are the same.
+
+    :ivar made: The number of questions made so far.
+    """
+
+    made: int = 0
+
+    def get_questions(self, **kwargs) -> List[Question]:
+        """Return made up questions."""
+        amount: int = kwargs.get('amount', 10)
+        difficulty: QuestionDifficulties = kwargs.get(
+            'difficulty', QuestionDifficulties.easy
+        )
+        questions: List[Question] = []
+        i: int
+        for i in range(self.made, self.made + amount):
+            answers: List[Answer] = [Answer('Right', True)]
+            answers.extend(Answer(f'Wrong {j}', False) for j in range(3))
+            questions.append(
+                Question(
+                    f'Category {i % 5}', f'Question {i}?',
+                    QuestionTypes.multiple, difficulty, answers
+                )
+            )
+        self.made += amount
+        return questions
+
+
+class VirtualClock(Clock):
+    """A pyglet clock whose time only moves when it is told to.
+
+    Scheduled functions can be run as soon as they are due, rather than
+    waiting for real time to pass.
+
+    :ivar now: The current time on this clock, in seconds.
+    """
+
+    def __init__(self) -> None:
+        self.now: float = 0.0
+        super().__init__(time_function=self.get_time)
+
+    def get_time(self) -> float:
+        """Return the current time on this clock."""
+        return self.now
+
+    def advance(self) -> bool:
+        """Move time on to the next scheduled function, and call it.
+
+        Returns ``False`` if nothing is scheduled.
+        """
+        delay: Optional[float] = self.get_sleep_time(True)
+        if delay is None:
+            return False
+        self.now += delay
+        self.tick(poll=True)
+        return True
+
+
+@contextmanager
+def virtual_clock(clock: VirtualClock) -> Iterator[VirtualClock]:
+    """Make the given clock the default pyglet clock.
+
+    Functions scheduled by promises and levels go on ``clock``, rather than the
+    clock which the game would tick. The previous clock is put back
+    afterwards.
+
+    :param clock: The clock to use.
+    """
+    saved: Clock = get_default()
+    set_default(clock)
+    try:
+        yield clock
+    finally:
+        set_default(saved)
+
+
+def drain_promise(level: QuizLevel, clock: VirtualClock) -> int:
+    """Run the level's guess promise to completion without waiting.
+
+    Returns the number of steps the promise took.
+
+    :param level: The level whose promise should be run.
+
+    :param clock: The clock the promise was scheduled on.
+    """
+    steps: int = 0
+    while level.guess_promise is not None and clock.advance():
+        steps += 1
+    return steps
+
+
+@attrs(auto_attribs=True)
+class ScriptedPlayer:
+    """A player who answers questions according to a script.
+
+    :ivar level: The level this player is playing.
+
+    :ivar accuracy: The chance this player will guess correctly.
+
+    :ivar browse: How many answers this player reads before guessing.
+
+    :ivar clock: The clock to run guesses on.
+    """
+
+    level: QuizLevel
+    accuracy: float = 0.7
+    browse: int = 2
+    random: Random = Factory(Random)
+    clock: VirtualClock = Factory(VirtualClock)
+
+    def take_turn(self) -> None:
+        """Read some answers, then guess."""
+        level: QuizLevel = self.level
+        assert level.answers is not None
+        _: int
+        for _ in range(self.browse):
+            level.move_down()
+        level.move_up()
+        answers: List[Answer] = level.answers.answers
+        i: int = answers.index(level.answers.correct)
+        if self.random.random() >= self.accuracy:
+            i = (i + 1) % len(answers)
+        with virtual_clock(self.clock):
+            level.guess(i)()
+            drain_promise(level, self.clock)
+
+
+@attrs(auto_attribs=True)
+class SimulationReport:
+    """The results of a simulation.
+
+    :ivar turns: The number of turns taken.
+
+    :ivar cpu_time: The CPU time taken by all turns, in seconds.
+
+    :ivar memory_samples: The number of bytes allocated, sampled throughout the
+        session. This list is empty if memory was not traced.
+    """
+
+    turns: int
+    cpu_time: float
+    memory_samples: List[int]
+
+    @property
+    def turn_time(self) -> float:
+        """The average CPU time per turn, in seconds."""
+        return self.cpu_time / max(self.turns, 1)
+
+    @property
+    def turns_per_second(self) -> float:
+        """The number of turns which can be taken per CPU second."""
+        return self.turns / self.cpu_time if self.cpu_time else 0.0
+
+    @property
+    def memory_growth(self) -> int:
+        """The number of bytes memory grew by between the first and last
+        samples."""
+        if not self.memory_samples:
+            return 0
+        return self.memory_samples[-1] - self.memory_samples[0]
+
+    def __str__(self) -> str:
+        lines: List[str] = [
+            f'Turns: {self.turns}',
+            'CPU time: %.3f seconds' % self.cpu_time,
+            'Per turn: %.1f microseconds' % (self.turn_time * 1000000),
+            'Turns per second: %.0f' % self.turns_per_second
+        ]
+        if self.memory_samples:
+            lines.append(f'Memory growth: {self.memory_growth} bytes')
+        return '\n'.join(lines)
+
+
+@attrs(auto_attribs=True)
+class Simulation:
+    """Runs any number of scripted players through adaptive quiz levels.
+
+    :ivar players: The number of players to simulate.
+
+    :ivar seed: The seed for the random number generator, so that runs can be
+        repeated.
+
+    :ivar clock: The clock all players run their guesses on.
+    """
+
+    players: int = 10
+    seed: int = 0
+    game: HeadlessGame = Factory(HeadlessGame)
+    # Made up questions are not rate limited, so there is no need to wait
+    # between requests.
+    engine: AdaptiveEngine = Factory(
+        lambda: AdaptiveEngine(SyntheticFactory(), min_interval=0.0)
+    )
+    clock: VirtualClock = attrib(
+        default=Factory(VirtualClock), init=False, repr=False
+    )
+    scripted_players: List[ScriptedPlayer] = attrib(
+        default=Factory(list), init=False, repr=False
+    )
+
+    def __attrs_post_init__(self) -> None:
+        random: Random = Random(self.seed)
+        i: int
+        for i in range(self.players):
+            level: AdaptiveQuizLevel = AdaptiveQuizLevel(
+                self.game, sounds.music_directory / 'easy_level.mp3',
+                self.engine, player=f'Player {i + 1}'
+            )
+            # Ask the first question directly, since pushing the level would
+            # start the music.
+            level.next_question()
+            self.scripted_players.append(
+                ScriptedPlayer(
+                    level, accuracy=random.random(),
+                    browse=random.randint(0, 4),
+                    random=Random(random.random()), clock=self.clock
+                )
+            )
+
+    def run(
+        self, turns: int, trace_memory: bool = False, samples: int = 10
+    ) -> SimulationReport:
+        """Have every player take the given number of turns.
+
+        :param turns: The number of turns each player should take.
+
+        :param trace_memory: Whether or not to sample memory use with
+            ``tracemalloc``. Doing so slows the simulation down.
+
+        :param samples: The number of times to sample memory use.
+        """
+        memory_samples: List[int] = []
+        every: int = max(turns // samples, 1)
+        if trace_memory:
+            tracemalloc.start()
+        cpu_time: float = 0.0
+        try:
+            with stubbed_sounds():
+                turn: int
+                for turn in range(turns):
+                    if trace_memory and turn % every == 0:
+                        memory_samples.append(
+                            tracemalloc.get_traced_memory()[0]
+                        )
+                    started: float = process_time()
+                    player: ScriptedPlayer
+                    for player in self.scripted_players:
+                        player.take_turn()
+                    cpu_time += process_time() - started
+            if trace_memory:
+                memory_samples.append(tracemalloc.get_traced_memory()[0])
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+        return SimulationReport(
+            turns * len(self.scripted_players), cpu_time, memory_samples
+        )
@@ -1,13 +1,37 @@
 """Provides various sound constants."""
 
 from pathlib import Path
+from typing import Dict, Iterable, Set
 
+from attr import Factory, attrib, attrs
 from earwax import BufferDirectory
+from earwax.sound import Buffer, buffers
+
+
+@attrs(auto_attribs=True, frozen=True)
+class PathDirectory:
+    """A directory of sound files, which are only decoded when played.
+
+    :ivar path: The directory the files are in.
+
+    :ivar paths: A dictionary of ``filename: Path`` pairs.
+    """
+
+    path: Path
+    paths: Dict[str, Path] = attrib(default=Factory(dict), init=False)
+
+    def __attrs_post_init__(self) -> None:
+        p: Path
+        for p in self.path.iterdir():
+            if p.is_file():
+                p = p.resolve()
+                self.paths[p.name] = p
+
 
 sounds_directory: Path = Path('sounds').resolve()
 
 music_directory: Path = sounds_directory / 'music'
-music: BufferDirectory
+music: PathDirectory
 
 icons_directory: Path = sounds_directory / 'icons'
 icons: BufferDirectory
@@ -25,10 +49,68 @@ loading_sound: Path = sounds_directory / 'loading.mp3'
 
 
 def load_sounds() -> None:
-    """Load all sounds and music."""
+    """Load all sounds.
+
+    Music files are large, so they are not decoded until they are played.
+    """
     global music, icons, footsteps, players, lifelines
-    music = BufferDirectory(music_directory)
+    music = PathDirectory(music_directory)
     icons = BufferDirectory(icons_directory)
     footsteps = BufferDirectory(footsteps_directory)
     players = BufferDirectory(players_directory)
     lifelines = BufferDirectory(lifelines_directory)
+
+
+def buffer_size(buffer: Buffer) -> int:
+    """Return the number of bytes the given buffer takes up once decoded."""
+    return buffer.get_channels() * buffer.get_length_in_samples() * 2
+
+
+def buffers_size(values: Iterable[Buffer]) -> int:
+    """Return the number of bytes taken up by all the given buffers."""
+    return sum(buffer_size(b) for b in values)
+
+
+def paths_size(paths: Iterable[Path]) -> int:
+    """Return the number of bytes taken up by the decoded buffers for the
+    given files.
+
+    Files which have not been played yet take up nothing.
+    """
+    size: int = 0
+    p: Path
+    for p in paths:
+        buffer: Buffer = buffers.get(f'file://{p}', None)
+        if buffer is not None:
+            size += buffer_size(buffer)
+    return size
+
+
+def music_buffers(playing: Iterable[Path] = ()) -> Dict[str, Buffer]:
+    """Return the decoded music buffers held in earwax's buffer cache.
+
+    :param playing: The paths of music which is currently playing, whose
+        buffers will be left out.
+    """
+    skip: Set[str] = {f'file://{p}' for p in playing}
+    prefix: str = f'file://{music_directory}/'
+    return {
+        url: buffer for url, buffer in buffers.items()
+        if url.startswith(prefix) and url not in skip
+    }
+
+
+def release_music(playing: Iterable[Path] = ()) -> None:
+    """Free the decoded buffers for music which is not playing.
+
+    Buffers are removed from earwax's cache before they are destroyed, so that
+    the next time a track is played, its file is decoded again.
+
+    :param playing: The paths of music which is currently playing, and must
+        not be freed.
+    """
+    url: str
+    buffer: Buffer
+    for url, buffer in music_buffers(playing).items():
+        del buffers[url]
+        buffer.destroy()
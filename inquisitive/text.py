@@ -0,0 +1,71 @@
+"""Provides functions for normalising question text.
+
+There are only a few dozen categories, so the functions which work on category
+names are cached. Question text is different every time, so it is not.
+"""
+
+import re
+from functools import lru_cache
+from hashlib import sha1
+from html import unescape
+from unicodedata import normalize
+
+cache_size: int = 128
+
+whitespace_re = re.compile(r'\s+')
+slug_strip_re = re.compile(r'[^\w\s-]')
+slug_separator_re = re.compile(r'[-\s]+')
+
+
+def unescape_text(text: str) -> str:
+    """Return ``text`` with HTML entities replaced and whitespace collapsed."""
+    return whitespace_re.sub(' ', unescape(text)).strip()
+
+
+def make_slug(text: str) -> str:
+    """Return a slug suitable for use as a filename.
+
+    This gives the same results as the ``slugify`` function from Django 3.2
+    and later. Older versions of Django did not strip leading and trailing
+    hyphens and underscores, so a text which begins or ends with either will
+    get a different slug than it did in trees made with those versions.
+    """
+    text = normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    text = slug_strip_re.sub('', text.lower())
+    return slug_separator_re.sub('-', text).strip('-_')
+
+
+@lru_cache(maxsize=cache_size)
+def category_slug(name: str) -> str:
+    """Return a slug made from a category name."""
+    return make_slug(name)
+
+
+@lru_cache(maxsize=cache_size)
+def category_speech(name: str) -> str:
+    """Return a category name in a form which reads well when spoken.
+
+    Category names are left escaped when questions are fetched, to keep their
+    slugs stable, so HTML entities are replaced here instead.
+    """
+    return unescape_text(name).replace(':', ' and')
+
+
+def question_speech(text: str, boolean: bool) -> str:
+    """Return question text in a form suitable for speaking.
+
+    :param text: The text of the question.
+
+    :param boolean: Whether or not the question is a true or false question.
+    """
+    if boolean:
+        return f'True or false: {text}'
+    return text
+
+
+def question_id(category_name: str, difficulty: str, text: str) -> str:
+    """Return an ID which will be the same for a given question every time it
+    is fetched."""
+    return sha1(
+        f'{category_name}\n{difficulty}\n{text}'.encode()
+    ).hexdigest()[:16]
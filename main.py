@@ -1,40 +1,68 @@
 """Main entry point."""
 
+from logging import INFO, Logger, basicConfig, getLogger
+from pathlib import Path
+from typing import List
+
 from earwax import Game, ThreadedPromise
+from pyglet.clock import schedule_interval
 from pyglet.window import Window
 
 from inquisitive import sounds
+from inquisitive.adaptive import AdaptiveEngine
+from inquisitive.memory import MemoryBudget
 from inquisitive.open_trivia_db import QuestionDifficulties, QuestionFactory
-from inquisitive.quiz_level import QuizLevel
+from inquisitive.quiz_level import AdaptiveQuizLevel
+
+# Kiosk machines have no console, so log to a file.
+basicConfig(filename='inquisitive.log', level=INFO)
+logger: Logger = getLogger('inquisitive')
 
 game: Game = Game(name='Inquisitive')
 factory: QuestionFactory = QuestionFactory()
+engine: AdaptiveEngine = AdaptiveEngine(factory, executor=game.thread_pool)
+
+level: AdaptiveQuizLevel
 
-easy_level: QuizLevel
-medium_level: QuizLevel
-hard_level: QuizLevel
+# How many bytes of sound, questions, stats, and level state to keep around.
+budget: MemoryBudget = MemoryBudget(64 * 1024 * 1024)
+budget.add('Question pools', engine.snapshot, release=engine.trim)
+budget.add('Player stats', lambda: engine.players)
 
 promise: ThreadedPromise = ThreadedPromise(game.thread_pool)
 
 
 @promise.register_func
 def load() -> None:
-    global easy_level, medium_level, hard_level
+    global level
     game.output('Loading...', interrupt=True)
     sounds.load_sounds()
     factory.generate_token()
-    easy_level = QuizLevel(
-        game, factory.get_questions(difficulty=QuestionDifficulties.easy),
-        sounds.music.paths['easy_level.mp3']
+    engine.fetch(QuestionDifficulties.easy)
+    level = AdaptiveQuizLevel(
+        game, sounds.music.paths['easy_level.mp3'], engine
     )
-    medium_level = QuizLevel(
-        game, factory.get_questions(difficulty=QuestionDifficulties.medium),
-        sounds.music.paths['medium_level.mp3']
-    )
-    hard_level = QuizLevel(
-        game, factory.get_questions(difficulty=QuestionDifficulties.hard),
-        sounds.music.paths['hard_level.mp3']
+    budget.add('Quiz level', lambda: (level.question, level.answers))
+
+    def playing_music() -> List[Path]:
+        """Return the paths of the music the level is playing."""
+        return [level.music_path] if level.tracks else []
+
+    # Music is decoded when it is played, so only tracks which are playing
+    # are counted, and buffers left over from earlier tracks can be freed.
+    budget.add('Music tracks', playing_music, measure=sounds.paths_size)
+    budget.add(
+        'Music buffers', lambda: sounds.music_buffers(playing_music()),
+        release=lambda: sounds.release_music(playing_music()),
+        measure=lambda d: sounds.buffers_size(d.values())
     )
+    name: str
+    for name in ('icons', 'footsteps', 'lifelines', 'players'):
+        budget.add(
+            f'{name.title()} buffers',
+            lambda name=name: getattr(sounds, name).buffers.values(),
+            measure=sounds.buffers_size
+        )
 
 
 @promise.event
@@ -46,7 +74,16 @@ def on_error(e: Exception) -> None:
 def on_done(value: None) -> None:
     game.interface_sound_player.generator.destroy()
     game.interface_sound_player.generator = None
-    game.push_level(easy_level)
+    game.push_level(level)
+    schedule_interval(enforce_budget, 60.0)
+
+
+def enforce_budget(dt: float) -> None:
+    """Release memory if the budget has been exceeded."""
+    released: List[str] = budget.enforce()
+    if released:
+        logger.info('Released %s.', ', '.join(released))
+    logger.info('Memory report:\n%s', budget.report())
 
 
 @game.event
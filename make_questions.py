@@ -1,15 +1,24 @@
 from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from io import BytesIO
+from multiprocessing import Value
+from multiprocessing.sharedctypes import Synchronized
+from os import getpid
 from pathlib import Path
+from random import uniform
 from shutil import rmtree
-from time import time
-from typing import List
+from time import sleep, time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
-from django.utils.text import slugify
+from requests import RequestException
 from TTS.server.server import synthesizer
 
-from inquisitive.open_trivia_db import (Answer, Question, QuestionFactory,
-                                        QuestionTypes)
+from inquisitive.open_trivia_db import (Answer, Category, NoResults,
+                                        Question, QuestionCount,
+                                        QuestionDifficulties, QuestionFactory,
+                                        RateLimit, TokenEmpty, get_categories,
+                                        get_question_count)
+from inquisitive.text import make_slug
 
 parser: ArgumentParser = ArgumentParser(
     formatter_class=ArgumentDefaultsHelpFormatter
@@ -20,6 +29,16 @@ parser.add_argument(
     default=1000
 )
 
+parser.add_argument(
+    '-a', '--harvest', action='store_true',
+    help='Harvest every question, sharded by category and difficulty'
+)
+
+parser.add_argument(
+    '-w', '--workers', type=int, default=None,
+    help='The number of harvest workers (defaults to the number of CPUs)'
+)
+
 wav: str = '.wav'
 txt: str = '.txt'
 
@@ -27,21 +46,53 @@ sounds_dir: Path = Path('sounds')
 questions_dir: Path = sounds_dir / 'questions'
 categories_dir: Path = sounds_dir / 'categories'
 difficulties_dir: Path = sounds_dir / 'difficulties'
+# Holds an empty file for every question ID which has been written.
+ids_dir: Path = sounds_dir / 'ids'
 question_filename: str = 'question'
 correct_filename: str = 'correct'
 
+# The most questions the API will return at once.
+max_amount: int = 50
+
+# How many times to try a request before giving up, and how long to wait
+# before the first retry. The wait roughly doubles with every attempt, and is
+# randomised so that workers do not all retry at once.
+max_attempts: int = 6
+retry_delay: float = 5.0
+
+# The API only allows one request every 5 seconds from each address.
+min_interval: float = 5.0
+
+# The factory used by the current harvest worker process.
+worker_factory: Optional[QuestionFactory] = None
+
+# The time of the last request made by any harvest process, shared between
+# them so that their requests are spaced out.
+last_request: Optional[Synchronized] = None
+
+Shard = Tuple[Category, QuestionDifficulties, int]
+T = TypeVar('T')
+
 
 def ensure_path(p: Path) -> None:
     """Ensure the path ``p`` exists."""
     if not p.is_dir():
         print(f'Creating directory {p}...')
-        p.mkdir()
+        p.mkdir(exist_ok=True)
+
+
+def temporary_path(path: Path) -> Path:
+    """Return a path to write to before renaming to ``path``, so that
+    workers writing the same file never see each other's partial output."""
+    return path.with_name(f'.{path.name}.{getpid()}')
 
 
 def dump_audio(path: Path, text: str) -> None:
     data: BytesIO = synthesizer.tts(text)
-    with path.open('wb') as fb:
+    tmp: Path = temporary_path(path)
+    with tmp.open('wb') as fb:
         fb.write(data.read())
+    tmp.replace(path)
 
 
 def dump_speech(directory: Path, filename: str, text: str) -> None:
@@ -50,13 +101,203 @@ def dump_speech(directory: Path, filename: str, text: str) -> None:
     txt_file: Path = directory / (filename + txt)
     if not txt_file.is_file():
         print(f'Writing {txt_file}...')
-        with txt_file.open('w') as fa:
+        tmp: Path = temporary_path(txt_file)
+        with tmp.open('w') as fa:
             fa.write(text)
+        tmp.replace(txt_file)
     wav_file: Path = directory / (filename + wav)
     if not wav_file.is_file():
         dump_audio(wav_file, text)
 
 
+def dump_question(q: Question) -> bool:
+    """Write the given question to disk.
+
+    Returns ``True`` if the question was written, or ``False`` if it was a
+    duplicate.
+
+    Questions are claimed by creating a file named after their ID, which is
+    atomic, so only one worker can write any given question. Questions
+    written before IDs were recorded are caught by their directory already
+    existing.
+    """
+    started = time()
+    id_file: Path = ids_dir / q.id
+    try:
+        id_file.touch(exist_ok=False)
+    except FileExistsError:
+        print('Skipping duplicate question.')
+        return False
+    p: Path = questions_dir / q.category_slug
+    ensure_path(p)
+    claimed: Optional[Path] = None
+    try:
+        dump_speech(categories_dir, q.category_slug, q.category_speech)
+        difficulty: str = q.difficulty.name
+        p /= difficulty
+        ensure_path(p)
+        dump_speech(difficulties_dir, make_slug(difficulty), difficulty)
+        p /= q.slug
+        try:
+            p.mkdir()
+        except FileExistsError:
+            print('Skipping duplicate question.')
+            return False
+        claimed = p
+        answers_dir: Path = p / 'answers'
+        answers_dir.mkdir()
+        dump_speech(p, question_filename, q.speech)
+        i: int
+        a: Answer
+        for i, a in enumerate(q.answers):
+            dump_speech(
+                p if a.correct else answers_dir,
+                'correct' if a.correct else str(i),
+                a.text
+            )
+        print(
+            'Finished with question in %.2f seconds.' % (
+                time() - started
+            )
+        )
+        return True
+    except Exception as e:
+        # Only remove the question's own directory, since the category and
+        # difficulty directories may be shared with other workers.
+        id_file.unlink()
+        if claimed is not None:
+            rmtree(claimed)
+            print('Removing directory because of an error:')
+        if not isinstance(
+            e, (IndexError, RuntimeError, UnicodeEncodeError)
+        ):
+            raise
+        return False
+
+
+def get_shards() -> List[Shard]:
+    """Return every category and difficulty which has questions, along with
+    how many questions each holds."""
+    shards: List[Shard] = []
+    category: Category
+    for category in get_categories():
+        count: QuestionCount = get_question_count(category)
+        d: QuestionDifficulties
+        for d in QuestionDifficulties:
+            total: int = getattr(count, d.name)
+            if total:
+                shards.append((category, d, total))
+    return shards
+
+
+def throttle() -> None:
+    """Wait until at least ``min_interval`` seconds have passed since any
+    harvest process last made a request.
+
+    Outside of a harvest, this function does nothing.
+    """
+    if last_request is None:
+        return
+    with last_request.get_lock():
+        wait: float = last_request.value + min_interval - time()
+        if wait > 0:
+            sleep(wait)
+        last_request.value = time()
+
+
+def with_retry(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Call ``func``, retrying with a growing delay if the API is rate
+    limited, or there is a network error."""
+    delay: float = retry_delay
+    attempt: int = 1
+    while True:
+        throttle()
+        try:
+            return func(*args, **kwargs)
+        except (RateLimit, RequestException) as e:
+            if attempt == max_attempts:
+                raise
+            wait: float = uniform(delay, delay * 1.5)
+            print(f'{e!r}, retrying in {wait:.1f} seconds...')
+            sleep(wait)
+            delay *= 2
+            attempt += 1
+
+
+def init_worker(last: Synchronized) -> None:
+    """Give the current process its own factory, and the request time shared
+    by all harvest processes."""
+    global worker_factory, last_request
+    worker_factory = QuestionFactory()
+    last_request = last
+
+
+def harvest_shard(shard: Shard) -> int:
+    """Write every question in the given shard, and return how many were
+    written."""
+    assert worker_factory is not None
+    if worker_factory.token is None:
+        with_retry(worker_factory.generate_token)
+    category, difficulty, remaining = shard
+    written: int = 0
+    print(f'Harvesting {difficulty.name} questions from {category.name}...')
+    while remaining > 0:
+        try:
+            questions: List[Question] = with_retry(
+                worker_factory.get_questions,
+                amount=min(remaining, max_amount), category=category,
+                difficulty=difficulty
+            )
+        except (NoResults, TokenEmpty):
+            break
+        remaining -= len(questions)
+        q: Question
+        for q in questions:
+            if dump_question(q):
+                written += 1
+    return written
+
+
+def harvest(workers: Optional[int]) -> int:
+    """Harvest the whole database, using ``workers`` processes.
+
+    Shards which fail are reported, and do not stop the others.
+
+    Returns the number of questions written.
+    """
+    last: Synchronized = Value('d', 0.0)
+    init_worker(last)
+    print('Counting questions...')
+    shards: List[Shard] = with_retry(get_shards)
+    print(f'Harvesting {len(shards)} shards...')
+    n: int = 0
+    failed: List[Shard] = []
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(last,)
+    ) as executor:
+        futures: Dict[Future, Shard] = {
+            executor.submit(harvest_shard, shard): shard for shard in shards
+        }
+        future: Future
+        for future in as_completed(futures):
+            category, difficulty, _ = futures[future]
+            try:
+                n += future.result()
+            except Exception as e:
+                print(
+                    f'Failed to harvest {difficulty.name} questions from '
+                    f'{category.name}: {e!r}'
+                )
+                failed.append(futures[future])
+                continue
+            print(f'Written {n} questions.')
+    if failed:
+        print(f'{len(failed)} of {len(shards)} shards failed:')
+        for category, difficulty, _ in failed:
+            print(f'{category.name} ({difficulty.name})')
+    return n
+
+
 if __name__ == '__main__':
     args = parser.parse_args()
     n: int = 0
@@ -64,6 +305,10 @@ if __name__ == '__main__':
     ensure_path(questions_dir)
     ensure_path(categories_dir)
     ensure_path(difficulties_dir)
+    ensure_path(ids_dir)
+    if args.harvest:
+        harvest(args.workers)
+        raise SystemExit
     factory: QuestionFactory = QuestionFactory()
     print('Generating token...')
     factory.generate_token()
@@ -72,48 +317,6 @@ if __name__ == '__main__':
         questions: List[Question] = factory.get_questions()
         q: Question
         for q in questions:
-            started = time()
-            category_slug = slugify(q.category_name)
-            p: Path = questions_dir / category_slug
-            ensure_path(p)
-            try:
-                dump_speech(
-                    categories_dir, category_slug,
-                    q.category_name.replace(':', ' and')
-                )
-                difficulty: str = q.difficulty.name
-                p /= difficulty
-                ensure_path(p)
-                dump_speech(difficulties_dir, slugify(difficulty), difficulty)
-                p /= slugify(q.text)
-                if p.is_dir():
-                    print('Skipping duplicate question.')
-                    continue
+            if dump_question(q):
                 n += 1
-                print(f'Question {n} / {args.number}:')
-                p.mkdir()
-                answers_dir: Path = p / 'answers'
-                answers_dir.mkdir()
-                if q.type == QuestionTypes.boolean:
-                    q.text = f'True of false: {q.text}'
-                dump_speech(p, question_filename, q.text)
-                i: int
-                a: Answer
-                for i, a in enumerate(q.answers):
-                    dump_speech(
-                        p if a.correct else answers_dir,
-                        'correct' if a.correct else str(i),
-                        a.text
-                    )
-                print(
-                    'Finished with question in %.2f seconds.' % (
-                        time() - started
-                    )
-                )
-            except Exception as e:
-                rmtree(p)
-                print('Removing directory because of an error:')
-                if not isinstance(
-                    e, (IndexError, RuntimeError, UnicodeEncodeError)
-                ):
-                    raise
+                print(f'Question {n} / {args.number}.')
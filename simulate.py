@@ -0,0 +1,35 @@
+"""Run quiz levels headlessly, to measure the cost of the game logic."""
+
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+
+from inquisitive.simulation import Simulation
+
+parser: ArgumentParser = ArgumentParser(
+    formatter_class=ArgumentDefaultsHelpFormatter
+)
+
+parser.add_argument(
+    '-p', '--players', type=int, help='The number of players to simulate',
+    default=1000
+)
+
+parser.add_argument(
+    '-t', '--turns', type=int, help='The number of turns each player takes',
+    default=100
+)
+
+parser.add_argument(
+    '-m', '--trace-memory', action='store_true',
+    help='Sample memory use throughout the session'
+)
+
+parser.add_argument(
+    '-s', '--seed', type=int, help='The seed for scripted players', default=0
+)
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    print(f'Creating {args.players} players...')
+    simulation: Simulation = Simulation(players=args.players, seed=args.seed)
+    print(f'Running {args.turns} turns...')
+    print(simulation.run(args.turns, trace_memory=args.trace_memory))
@@ -0,0 +1,169 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+
+from inquisitive.adaptive import AdaptiveEngine, PlayerStats
+from inquisitive.open_trivia_db import (Answer, Question,
+                                        QuestionDifficulties, QuestionFactory,
+                                        QuestionRecord, QuestionTypes,
+                                        TokenEmpty)
+
+
+class FakeFactory(QuestionFactory):
+    """A factory which makes up questions, rather than asking the API."""
+
+    calls: int = 0
+
+    def get_questions(self, **kwargs) -> List[Question]:
+        self.calls += 1
+        d: QuestionDifficulties = kwargs['difficulty']
+        return [
+            Question(
+                f'Category {i % 2}', f'{d.name} question {i}?',
+                QuestionTypes.boolean, d,
+                [Answer('True', True), Answer('False', False)]
+            ) for i in range(kwargs['amount'])
+        ]
+
+
+def test_player_stats() -> None:
+    s: PlayerStats = PlayerStats()
+    assert s.answered == 0
+    assert s.difficulty is QuestionDifficulties.easy
+    s.record(True, 4.0)
+    assert s.answered == 1
+    assert s.correct == 1
+    assert s.response_time == 4.0
+    assert s.accuracy > 0.5
+    s.record(False, 8.0)
+    assert s.answered == 2
+    assert s.correct == 1
+    assert 4.0 < s.response_time < 8.0
+
+
+def test_next_question() -> None:
+    f: FakeFactory = FakeFactory()
+    e: AdaptiveEngine = AdaptiveEngine(
+        f, batch_size=6, low_water=2, min_interval=0.0
+    )
+    q: Question = e.next_question('test')
+    assert f.calls == 1
+    assert q.difficulty is QuestionDifficulties.easy
+    assert len(e.pools[QuestionDifficulties.easy]) == 5
+    assert e.get_player('test').last_category == q.category_name
+    q2: Question = e.next_question('test')
+    assert q2.category_name != q.category_name
+    while len(e.pools[QuestionDifficulties.easy]) > 2:
+        e.next_question('test')
+    e.next_question('test')
+    assert f.calls == 2
+    assert not e.pending
+
+
+def test_promotion() -> None:
+    e: AdaptiveEngine = AdaptiveEngine(FakeFactory(), min_interval=0.0)
+    s: PlayerStats = e.get_player('test')
+    e.record_answer('test', True, 2.0)
+    e.record_answer('test', True, 2.0)
+    assert s.difficulty is QuestionDifficulties.medium
+    assert s.accuracy < e.promote_accuracy
+    for _ in range(5):
+        e.record_answer('test', False, 2.0)
+    assert s.difficulty is QuestionDifficulties.easy
+
+
+def test_slow_players_not_promoted() -> None:
+    e: AdaptiveEngine = AdaptiveEngine(FakeFactory(), min_interval=0.0)
+    for _ in range(5):
+        e.record_answer('test', True, 60.0)
+    assert e.get_player('test').difficulty is QuestionDifficulties.easy
+
+
+def test_fallback_difficulty() -> None:
+    e: AdaptiveEngine = AdaptiveEngine(FakeFactory(), min_interval=0.0)
+    e.fetch(QuestionDifficulties.hard)
+    s: PlayerStats = e.get_player('test')
+    assert e.choose_difficulty(s) is QuestionDifficulties.hard
+    e.fetch(QuestionDifficulties.medium)
+    assert e.choose_difficulty(s) is QuestionDifficulties.medium
+
+
+def test_trim() -> None:
+    e: AdaptiveEngine = AdaptiveEngine(
+        FakeFactory(), low_water=3, min_interval=0.0
+    )
+    e.fetch(QuestionDifficulties.easy)
+    assert len(e.pools[QuestionDifficulties.easy]) == 10
+    e.trim()
+    assert len(e.pools[QuestionDifficulties.easy]) == 3
+
+
+class EmptyFactory(QuestionFactory):
+    """A factory which has run out of questions."""
+
+    resets: int = 0
+
+    def get_questions(self, **kwargs) -> List[Question]:
+        raise TokenEmpty()
+
+    def reset_token(self) -> None:
+        self.resets += 1
+
+
+def test_promoted_player_gets_harder_questions() -> None:
+    e: AdaptiveEngine = AdaptiveEngine(FakeFactory(), min_interval=0.0)
+    q: Optional[Question] = e.next_question('test')
+    assert q is not None
+    assert q.difficulty is QuestionDifficulties.easy
+    e.record_answer('test', True, 2.0)
+    e.record_answer('test', True, 2.0)
+    assert e.get_player('test').difficulty is QuestionDifficulties.medium
+    q = e.next_question('test')
+    assert q is not None
+    assert q.difficulty is QuestionDifficulties.medium
+
+
+def test_no_questions() -> None:
+    f: EmptyFactory = EmptyFactory()
+    e: AdaptiveEngine = AdaptiveEngine(f, min_interval=0.0)
+    assert e.next_question('test') is None
+    assert isinstance(e.last_error, TokenEmpty)
+    assert f.resets == 1
+    assert not e.pending
+
+
+def test_background_errors() -> None:
+    with ThreadPoolExecutor() as executor:
+        e: AdaptiveEngine = AdaptiveEngine(
+            EmptyFactory(), executor=executor, min_interval=0.0
+        )
+        assert e.next_question('test') is None
+    assert isinstance(e.last_error, TokenEmpty)
+    assert not e.pending
+
+
+def test_snapshot() -> None:
+    e: AdaptiveEngine = AdaptiveEngine(FakeFactory(), min_interval=0.0)
+    e.fetch(QuestionDifficulties.hard)
+    snapshot: Dict[
+        QuestionDifficulties, Tuple[QuestionRecord, ...]
+    ] = e.snapshot()
+    assert len(snapshot[QuestionDifficulties.hard]) == 10
+    assert snapshot[QuestionDifficulties.easy] == ()
+    e.trim()
+    assert len(snapshot[QuestionDifficulties.hard]) == 10
+
+
+def test_throttle() -> None:
+    f: FakeFactory = FakeFactory()
+    e: AdaptiveEngine = AdaptiveEngine(f, min_interval=0.2)
+    started: float = monotonic()
+    e.fetch(QuestionDifficulties.easy)
+    assert monotonic() - started < 0.2
+    with ThreadPoolExecutor() as executor:
+        e.executor = executor
+        e.refill(QuestionDifficulties.medium)
+        e.refill(QuestionDifficulties.hard)
+    assert f.calls == 3
+    assert monotonic() - started >= 0.4
+    assert e.last_error is None
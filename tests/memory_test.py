@@ -0,0 +1,43 @@
+from collections import deque
+from typing import Deque, List
+
+from inquisitive.memory import MemoryBudget, MemoryReport, deep_size
+from inquisitive.open_trivia_db import Answer
+
+
+def test_deep_size() -> None:
+    a: Answer = Answer('Testing', True)
+    assert deep_size(a) > deep_size('Testing')
+    answers: List[Answer] = [a, a]
+    assert deep_size(answers) < deep_size([a, Answer('Testing', True)])
+    d: Deque[str] = deque(['hello world'])
+    assert deep_size(d) > deep_size(deque())
+
+
+def test_report() -> None:
+    b: MemoryBudget = MemoryBudget(10)
+    b.add('Strings', lambda: ['hello', 'world'])
+    r: MemoryReport = b.report()
+    assert list(r.sizes) == ['Strings']
+    assert r.total == deep_size(['hello', 'world'])
+    assert r.limit == 10
+    assert 'Strings' in str(r)
+
+
+def test_enforce() -> None:
+    small: List[str] = ['hello']
+    large: List[str] = [str(i) for i in range(1000)]
+    b: MemoryBudget = MemoryBudget(deep_size(small) + 1000)
+    b.add('Small', lambda: small, release=small.clear)
+    b.add('Large', lambda: large, release=large.clear)
+    assert b.enforce() == ['Large']
+    assert not large
+    assert small == ['hello']
+    assert b.enforce() == []
+
+
+def test_measure() -> None:
+    b: MemoryBudget = MemoryBudget(100)
+    b.add('Fixed', lambda: 'ignored', measure=lambda obj: 150)
+    assert b.report().sizes == {'Fixed': 150}
+    assert b.enforce() == []
@@ -5,7 +5,8 @@ from pytest import raises
 from inquisitive.open_trivia_db import (Answer, Category, InvalidTokenError,
                                         Question, QuestionCount,
                                         QuestionDifficulties, QuestionFactory,
-                                        QuestionTypes, get_categories,
+                                        QuestionRecord, QuestionTypes,
+                                        get_categories,
                                         get_question_count, get_questions,
                                         get_token)
 
@@ -90,3 +91,24 @@ def test_question_factory() -> None:
     questions: List[Question] = f.get_questions()
     assert isinstance(questions, list)
     assert isinstance(questions[0], Question)
+
+
+def test_question_record() -> None:
+    q: Question = Question(
+        'Testing', 'Is this a test?', QuestionTypes.multiple,
+        QuestionDifficulties.easy, [
+            Answer('No', False), Answer('Yes', True), Answer('Maybe', False)
+        ]
+    )
+    r: QuestionRecord = QuestionRecord.from_question(q)
+    assert r.answers == ('No', 'Yes', 'Maybe')
+    assert r.correct == 1
+    assert r.id == q.id
+    assert r.speech == q.speech
+    q2: Question = r.to_question()
+    assert q2 == q
+    assert q2.id is r.id
+    assert q2.slug is r.slug
+    assert q2.speech is r.speech
+    assert q2.category_slug is r.category_slug
+    assert q2.category_speech is r.category_speech
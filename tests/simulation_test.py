@@ -0,0 +1,45 @@
+from typing import List
+
+from pyglet.clock import Clock, get_default
+
+from inquisitive.open_trivia_db import Question
+# The sounds module is imported from the simulation module, which makes sure
+# pyglet doesn't try to open a window.
+from inquisitive.simulation import (HeadlessGame, Simulation,
+                                    SimulationReport, SyntheticFactory,
+                                    sounds, stubbed_sounds)
+
+
+def test_synthetic_factory() -> None:
+    f: SyntheticFactory = SyntheticFactory()
+    questions: List[Question] = f.get_questions(amount=3)
+    assert len(questions) == 3
+    questions.extend(f.get_questions(amount=3))
+    assert f.made == 6
+    assert len({q.text for q in questions}) == 6
+
+
+def test_stubbed_sounds() -> None:
+    assert not hasattr(sounds, 'icons')
+    with stubbed_sounds():
+        assert isinstance(sounds.icons, sounds.PathDirectory)
+        assert 'correct.mp3' in sounds.icons.paths
+    assert not hasattr(sounds, 'icons')
+
+
+def test_simulation() -> None:
+    default: Clock = get_default()
+    s: Simulation = Simulation(players=5)
+    assert len(s.scripted_players) == 5
+    r: SimulationReport = s.run(20, trace_memory=True, samples=4)
+    assert r.turns == 100
+    assert r.cpu_time > 0
+    assert len(r.memory_samples) == 5
+    g: HeadlessGame = s.game
+    assert g.spoken > r.turns
+    assert g.interface_sound_player.played == r.turns
+    assert len(s.engine.players) == 5
+    assert sum(p.answered for p in s.engine.players.values()) == r.turns
+    assert not hasattr(sounds, 'icons')
+    assert get_default() is default
+    assert not s.clock._schedule_interval_items
@@ -0,0 +1,55 @@
+from pathlib import Path
+from typing import Dict
+
+from earwax.sound import buffers
+
+from inquisitive import sounds
+
+
+class FakeBuffer:
+    """A buffer which has not really been decoded."""
+
+    destroyed: bool = False
+
+    def get_channels(self) -> int:
+        return 2
+
+    def get_length_in_samples(self) -> int:
+        return 100
+
+    def destroy(self) -> None:
+        self.destroyed = True
+
+
+def test_music_buffers() -> None:
+    playing: Path = sounds.music_directory / 'easy_level.mp3'
+    finished: Path = sounds.music_directory / 'hard_level.mp3'
+    icon: Path = sounds.icons_directory / 'correct.mp3'
+    fakes: Dict[Path, FakeBuffer] = {
+        p: FakeBuffer() for p in (playing, finished, icon)
+    }
+    p: Path
+    for p, buffer in fakes.items():
+        buffers[f'file://{p}'] = buffer
+    try:
+        assert sounds.paths_size([playing]) == 400
+        assert sounds.paths_size([sounds.music_directory / 'none.mp3']) == 0
+        assert list(sounds.music_buffers([playing]).values()) == [
+            fakes[finished]
+        ]
+        sounds.release_music([playing])
+        assert fakes[finished].destroyed
+        assert f'file://{finished}' not in buffers
+        assert not fakes[playing].destroyed
+        assert f'file://{playing}' in buffers
+        assert not fakes[icon].destroyed
+    finally:
+        for p in fakes:
+            buffers.pop(f'file://{p}', None)
+
+
+def test_path_directory() -> None:
+    d: sounds.PathDirectory = sounds.PathDirectory(sounds.music_directory)
+    assert d.paths['easy_level.mp3'] == (
+        sounds.music_directory / 'easy_level.mp3'
+    )
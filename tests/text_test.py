@@ -0,0 +1,67 @@
+from inquisitive.open_trivia_db import (Answer, Question,
+                                        QuestionDifficulties, QuestionTypes)
+from inquisitive.text import (category_slug, category_speech, make_slug,
+                              question_id, question_speech, unescape_text)
+
+
+def test_unescape_text() -> None:
+    assert unescape_text('Tom &amp; Jerry') == 'Tom & Jerry'
+    assert unescape_text('  What&#039;s   this? ') == 'What\'s this?'
+
+
+def test_make_slug() -> None:
+    assert make_slug('Entertainment: Books') == 'entertainment-books'
+    assert make_slug('Café -- Society?') == 'cafe-society'
+    assert make_slug('  _Hello_ ') == 'hello'
+
+
+def test_category_slug() -> None:
+    assert category_slug('Entertainment: Japanese Anime &amp; Manga') == (
+        'entertainment-japanese-anime-amp-manga'
+    )
+
+
+def test_category_speech() -> None:
+    assert category_speech('Science: Computers') == 'Science and Computers'
+    assert category_speech('History') == 'History'
+    assert category_speech('Entertainment: Japanese Anime &amp; Manga') == (
+        'Entertainment and Japanese Anime & Manga'
+    )
+
+
+def test_question_speech() -> None:
+    assert question_speech('The sky is blue.', True) == (
+        'True or false: The sky is blue.'
+    )
+    assert question_speech('Why?', False) == 'Why?'
+
+
+def test_question_id() -> None:
+    i: str = question_id('Testing', 'easy', 'Why?')
+    assert len(i) == 16
+    assert i == question_id('Testing', 'easy', 'Why?')
+    assert i != question_id('Testing', 'hard', 'Why?')
+
+
+def test_question() -> None:
+    q: Question = Question(
+        'Science: Nature', 'Trees are plants.', QuestionTypes.boolean,
+        QuestionDifficulties.easy, [
+            Answer('True', True), Answer('False', False)
+        ]
+    )
+    assert q.id == question_id('Science: Nature', 'easy', 'Trees are plants.')
+    assert q.slug == 'trees-are-plants'
+    assert q.speech == 'True or false: Trees are plants.'
+    assert q.category_slug == 'science-nature'
+    assert q.category_speech == 'Science and Nature'
+
+
+def test_question_precomputed() -> None:
+    q: Question = Question(
+        'Testing', 'Why?', QuestionTypes.multiple, QuestionDifficulties.easy,
+        [Answer('Because', True)], id='id', speech='speech'
+    )
+    assert q.id == 'id'
+    assert q.speech == 'speech'
+    assert q.slug == 'why'